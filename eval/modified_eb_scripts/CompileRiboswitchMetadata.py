@@ -2,8 +2,26 @@ import pandas as pd
 import zipfile
 import json
 import os
+import sys
 from pathlib import Path
 
+def merge_on_sequence(left, right, **kwargs):
+    """
+    pd.merge on 'sequence', joined through SequenceIndex when it is available.
+
+    SequenceIndex comes from the installed rnet_eb package or $RNETEB_PATH/tools;
+    without either, this is a plain pandas merge.
+    """
+    try:
+        from rnet_eb.sequence_index import SequenceIndex
+    except ImportError:
+        rnet_path = os.environ.get('RNETEB_PATH')
+        if rnet_path is None or not os.path.exists(os.path.join(rnet_path, 'tools', 'sequence_index.py')):
+            return pd.merge(left, right, on='sequence', **kwargs)
+        sys.path.append(os.path.join(rnet_path, 'tools'))
+        from sequence_index import SequenceIndex
+    return SequenceIndex(left).merge(right, **kwargs)
+
 def compile_z_metadata_with_metadata(directory, metadata_cols=None):
     """
     Extended version that keeps specified metadata columns.
@@ -54,7 +72,7 @@ def compile_z_metadata_with_metadata(directory, metadata_cols=None):
             temp_df = df[['sequence', nolig_col]].copy()
             if lig_col in df.columns:
                 temp_df[lig_col] = df[lig_col]
-            merged_df = merged_df.merge(temp_df, on='sequence', how='inner')
+            merged_df = merge_on_sequence(merged_df, temp_df, how='inner')
     
     return merged_df
 
@@ -0,0 +1,223 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Metrics where a lower value means a better package
+LOWER_IS_BETTER = ('rmse',)
+
+
+def load_bootstraps(bootstrap_files, metric='pearson', agg_field='Dataset', bootstrap_field='bootstrap_ind'):
+    """
+    Load ScoreRiboswitches `_BOOTSTRAPS.json.zip` outputs as one long dataframe.
+
+    Parameters:
+    -----------
+    bootstrap_files : list of str
+        Paths to bootstrap outputs from ScoreRiboswitches_*_Metadata.py
+    metric : str
+        Metric column to keep (spearman, pearson, or rmse)
+    agg_field : str
+        Field the results were aggregated over (default: 'Dataset')
+    bootstrap_field : str
+        Column with the bootstrap index. If missing, the index is recovered
+        from row order within each (package, agg_field) group.
+
+    Returns:
+    --------
+    DataFrame with columns ['package', agg_field, 'bootstrap', metric]
+    """
+    frames = []
+    for path in bootstrap_files:
+        print(f"Loading: {path}")
+        df = pd.read_json(path)
+        if bootstrap_field in df.columns:
+            df['bootstrap'] = df[bootstrap_field]
+        else:
+            df['bootstrap'] = df.groupby(['package', agg_field]).cumcount()
+        frames.append(df[['package', agg_field, 'bootstrap', metric]])
+    return pd.concat(frames, ignore_index=True)
+
+
+def to_dense(long_df, metric='pearson', agg_field='Dataset'):
+    """
+    Pivot long bootstrap results into a dense (package x dataset x bootstrap) array.
+
+    Missing (package, dataset, bootstrap) cells are NaN.
+
+    Returns:
+    --------
+    values : np.ndarray of shape (n_packages, n_datasets, n_bootstraps)
+    packages : np.ndarray of package names
+    datasets : np.ndarray of dataset names
+    """
+    packages, p_idx = np.unique(long_df['package'].to_numpy(dtype=str), return_inverse=True)
+    datasets, d_idx = np.unique(long_df[agg_field].to_numpy(dtype=str), return_inverse=True)
+    b_idx = long_df['bootstrap'].to_numpy(dtype=int)
+
+    values = np.full((len(packages), len(datasets), b_idx.max() + 1), np.nan)
+    values[p_idx, d_idx, b_idx] = long_df[metric].to_numpy(dtype=float)
+    return values, packages, datasets
+
+
+def merge_dense(old, new):
+    """
+    Merge two (values, packages, datasets) triples; packages in `new` replace those in `old`.
+    """
+    old_values, old_packages, old_datasets = old
+    new_values, new_packages, new_datasets = new
+
+    keep = ~np.isin(old_packages, new_packages)
+    packages = np.concatenate([old_packages[keep], new_packages])
+    datasets = np.union1d(old_datasets, new_datasets)
+    n_boot = max(old_values.shape[2], new_values.shape[2])
+
+    values = np.full((len(packages), len(datasets), n_boot), np.nan)
+    n_old = keep.sum()
+    values[:n_old, np.searchsorted(datasets, old_datasets), :old_values.shape[2]] = old_values[keep]
+    values[n_old:, np.searchsorted(datasets, new_datasets), :new_values.shape[2]] = new_values
+
+    order = np.argsort(packages)
+    return values[order], packages[order], datasets
+
+
+def save_dense(path, values, packages, datasets, metric='pearson', agg_field='Dataset'):
+    np.savez_compressed(path, values=values, packages=packages, datasets=datasets,
+                        metric=metric, agg_field=agg_field)
+
+
+def load_dense(path, metric='pearson', agg_field='Dataset'):
+    """
+    Load a dense array saved by save_dense, checking it holds `metric` aggregated over `agg_field`.
+    """
+    with np.load(path, allow_pickle=False) as f:
+        cached = (str(f['metric']) if 'metric' in f else None,
+                  str(f['agg_field']) if 'agg_field' in f else None)
+        if cached != (metric, agg_field):
+            raise ValueError(f"Cache {path} holds metric={cached[0]}, field={cached[1]}, "
+                             f"not metric={metric}, field={agg_field}")
+        return f['values'], f['packages'], f['datasets']
+
+
+def _summary(x, axis, prefix):
+    """
+    Mean, std and 2.5/97.5 percentiles of x along axis, ignoring NaNs.
+    """
+    return {
+        f'{prefix}_mean': np.nanmean(x, axis=axis),
+        f'{prefix}_std': np.nanstd(x, axis=axis, ddof=1),
+        f'{prefix}_percentile_2.5': np.nanpercentile(x, 2.5, axis=axis),
+        f'{prefix}_percentile_97.5': np.nanpercentile(x, 97.5, axis=axis),
+    }
+
+
+def rank_packages(values, packages, datasets, metric='pearson', agg_field='Dataset', ddof=0):
+    """
+    Compute per-dataset z-scores, rankings and bootstrap rank intervals in one vectorized pass.
+
+    Within every (dataset, bootstrap) the metric is z-scored across packages.
+    Each bootstrap then ranks packages by their mean z-score over datasets
+    (rank 1 is best; for metrics in LOWER_IS_BETTER, such as rmse, the lowest
+    z-score is best), giving a bootstrap distribution of ranks per package.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        (n_packages, n_datasets, n_bootstraps) metric values
+    packages, datasets : np.ndarray
+        Labels for the first two axes
+    metric : str
+        Metric name used for column names
+    agg_field : str
+        Name of the dataset field used for column names
+    ddof : int
+        Delta degrees of freedom for the across-package standard deviation
+
+    Returns:
+    --------
+    ranking : DataFrame, one row per package, sorted from worst to best mean z-score
+    zscores_by_dataset : DataFrame, one row per (package, dataset)
+    """
+    zcol = f'{metric}_zscore_by_{agg_field}'
+    mu = np.nanmean(values, axis=0, keepdims=True)
+    sd = np.nanstd(values, axis=0, ddof=ddof, keepdims=True)
+    zscores = (values - mu) / sd
+
+    n_packages, n_datasets, n_boot = values.shape
+
+    # Per (package, dataset): summarise over bootstraps
+    by_dataset = pd.DataFrame({
+        'package': np.repeat(packages, n_datasets),
+        agg_field: np.tile(datasets, n_packages),
+    })
+    for prefix, x in ((metric, values), (zcol, zscores)):
+        for col, stat in _summary(x, axis=2, prefix=prefix).items():
+            by_dataset[col] = stat.reshape(-1)
+    by_dataset = by_dataset.dropna(subset=[f'{metric}_mean']).reset_index(drop=True)
+
+    # Per package: summarise over all (dataset, bootstrap) cells
+    flat_values = values.reshape(n_packages, -1)
+    flat_z = zscores.reshape(n_packages, -1)
+    ranking = pd.DataFrame({'package': packages})
+    for prefix, x in ((metric, flat_values), (zcol, flat_z)):
+        for col, stat in _summary(x, axis=1, prefix=prefix).items():
+            ranking[col] = stat
+
+    # Bootstrap rank distribution: rank packages by mean z over datasets in each bootstrap
+    sign = -1 if metric in LOWER_IS_BETTER else 1
+    boot_z = sign * np.nanmean(zscores, axis=1)
+    boot_z = np.where(np.isnan(boot_z), -np.inf, boot_z)
+    ranks = np.argsort(np.argsort(-boot_z, axis=0, kind='stable'), axis=0) + 1
+    ranking['rank_mean'] = ranks.mean(axis=1)
+    ranking['rank_percentile_2.5'] = np.percentile(ranks, 2.5, axis=1)
+    ranking['rank_percentile_97.5'] = np.percentile(ranks, 97.5, axis=1)
+
+    ranking = ranking.sort_values(f'{zcol}_mean', ascending=(sign == 1)).reset_index(drop=True)
+    return ranking, by_dataset
+
+
+if __name__ == '__main__':
+
+    p = argparse.ArgumentParser(description="""Vectorized package ranking and z-scores from ScoreRiboswitches bootstraps""")
+
+    p.add_argument("bootstrap_files", action="store", nargs='*', help="_BOOTSTRAPS.json.zip files to add")
+    p.add_argument("-o", action="store", dest='outfile', required=True, help='Output prefix, writes <prefix>_<metric>_ranking.csv and <prefix>_<metric>_zscores_by_<field>.csv')
+    p.add_argument("--metric", action='store', default='pearson', help='spearman, pearson, or rmse')
+    p.add_argument("--field_to_aggregate", action='store', default='Dataset')
+    p.add_argument("--bootstrap_field", action='store', default='bootstrap_ind')
+    p.add_argument("--package_list", action='store', help='Text file with one package per line to include in the ranking')
+    p.add_argument("--cache", action='store', help='.npz file holding the dense bootstrap array for --metric and --field_to_aggregate. New bootstrap files are merged into it, replacing packages of the same name.')
+    p.add_argument("--ddof", action='store', type=int, default=0, help='Delta degrees of freedom for the across-package std')
+    args = p.parse_args()
+
+    dense = None
+    if args.cache and os.path.exists(args.cache):
+        dense = load_dense(args.cache, metric=args.metric, agg_field=args.field_to_aggregate)
+        print(f"Loaded {len(dense[1])} packages from cache {args.cache}")
+
+    if args.bootstrap_files:
+        long_df = load_bootstraps(args.bootstrap_files, metric=args.metric,
+                                  agg_field=args.field_to_aggregate, bootstrap_field=args.bootstrap_field)
+        new = to_dense(long_df, metric=args.metric, agg_field=args.field_to_aggregate)
+        dense = new if dense is None else merge_dense(dense, new)
+
+    if dense is None:
+        p.error('No bootstrap files given and no cache found')
+
+    if args.cache:
+        save_dense(args.cache, *dense, metric=args.metric, agg_field=args.field_to_aggregate)
+
+    values, packages, datasets = dense
+    if args.package_list:
+        with open(args.package_list) as f:
+            package_list = [line.strip() for line in f if line.strip()]
+        keep = np.isin(packages, package_list)
+        values, packages = values[keep], packages[keep]
+
+    print(f"Ranking {len(packages)} packages x {len(datasets)} datasets x {values.shape[2]} bootstraps")
+    ranking, by_dataset = rank_packages(values, packages, datasets, metric=args.metric,
+                                        agg_field=args.field_to_aggregate, ddof=args.ddof)
+
+    ranking.to_csv(f'{args.outfile}_{args.metric}_ranking.csv', index=False)
+    by_dataset.to_csv(f'{args.outfile}_{args.metric}_zscores_by_{args.field_to_aggregate}.csv', index=False)
+    print(f"Saved {args.outfile}_{args.metric}_ranking.csv and {args.outfile}_{args.metric}_zscores_by_{args.field_to_aggregate}.csv")
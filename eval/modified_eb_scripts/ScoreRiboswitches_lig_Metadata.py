@@ -3,12 +3,31 @@ from eternabench.stats import calculate_metric
 import pandas as pd
 import numpy as np
 from scipy.stats import pearsonr, spearmanr
+from ScoringCache import ScoringCache, score_packages_with_cache
 
 import pandas as pd
 import sys
 import argparse
 
-def ScoreRiboswitches(data, xdata, ydata, agg_field, n_bootstraps=10, package_list=None, metric='spearman'):
+def merge_on_sequence(left, right, **kwargs):
+    """
+    pd.merge on 'sequence', joined through SequenceIndex when it is available.
+
+    SequenceIndex comes from the installed rnet_eb package or $RNETEB_PATH/tools;
+    without either, this is a plain pandas merge.
+    """
+    try:
+        from rnet_eb.sequence_index import SequenceIndex
+    except ImportError:
+        rnet_path = os.environ.get('RNETEB_PATH')
+        if rnet_path is None or not os.path.exists(os.path.join(rnet_path, 'tools', 'sequence_index.py')):
+            return pd.merge(left, right, on='sequence', **kwargs)
+        sys.path.append(os.path.join(rnet_path, 'tools'))
+        from sequence_index import SequenceIndex
+    return SequenceIndex(left).merge(right, **kwargs)
+
+def ScoreRiboswitches(data, xdata, ydata, agg_field, n_bootstraps=10, package_list=None, metric='spearman',
+                      cache=None, seed=0):
     correlation_data = pd.DataFrame()
 
     if package_list is None:
@@ -22,8 +41,15 @@ def ScoreRiboswitches(data, xdata, ydata, agg_field, n_bootstraps=10, package_li
 
         tmp_data = data.loc[data[agg_field] == kind]
 
-        corr_data = calculate_metric(tmp_data, x_data=xdata, y_data=ydata, n_bootstraps=n_bootstraps,
-                                     package_list=package_list, metric=metric)
+        if cache is None:
+            corr_data = calculate_metric(tmp_data, x_data=xdata, y_data=ydata, n_bootstraps=n_bootstraps,
+                                         package_list=package_list, metric=metric)
+        else:
+            # Only packages whose predictions changed (or are new) are re-scored
+            corr_data, n_scored = score_packages_with_cache(calculate_metric, tmp_data, xdata, ydata, kind,
+                                                            package_list, cache, n_bootstraps=n_bootstraps,
+                                                            metric=metric, seed=seed)
+            print('  scored %d, cached %d' % (n_scored, len(package_list) - n_scored))
 
         corr_data[agg_field] = kind
         corr_data['Calculation'] = xdata
@@ -50,6 +76,8 @@ if __name__ == '__main__':
     p.add_argument("-v", "--verbose", action="store_true", help="Verbose")
     p.add_argument("-o", action="store", dest='outfile', help='name of output json file (default is <input_name>_BOOTSTRAPS.json.zip')
     p.add_argument("--package_list", action='store', help = 'List of packages to iterate over. ')
+    p.add_argument("--cache_dir", action='store', help='Directory of cached per-package bootstrap results. Packages whose predictions are unchanged are loaded from here instead of re-scored.')
+    p.add_argument("--seed", action='store', type=int, default=0, help='Random seed for bootstrapping (used with --cache_dir)')
     args = p.parse_args()
 
     basename = args.infile.split('/')[-1].split('.')[0]
@@ -66,7 +94,7 @@ if __name__ == '__main__':
         metadata_df = pd.read_json(args.metadata)
 
         keys_to_add = [k for k in df.keys() if 'p_' in k] + ['sequence']
-        metadata_df = metadata_df.merge(df[keys_to_add], on='sequence')
+        metadata_df = merge_on_sequence(metadata_df, df[keys_to_add])
 
         df = metadata_df
         print('Using metadata from %s, new df length = %d' % (args.metadata, len(df)))
@@ -83,10 +111,13 @@ if __name__ == '__main__':
         x_inputs = ['logkd_lig_scaled']
         y_inputs = ['log_kfold_est_lig_Z']
 
+    cache = ScoringCache(args.cache_dir) if args.cache_dir else None
+
     out = pd.DataFrame()
     for x_input, y_input in list(zip(x_inputs, y_inputs)):
         correlation_data = ScoreRiboswitches(df, x_input, y_input, agg_field=args.field_to_aggregate,
-                                             n_bootstraps=args.n_bootstraps, package_list=None, metric=args.metric)
+                                             n_bootstraps=args.n_bootstraps, package_list=None, metric=args.metric,
+                                             cache=cache, seed=args.seed)
 
         # Use pd.concat instead of append
         out = pd.concat([out, correlation_data], ignore_index=True)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+
+class ScoringCache:
+    """
+    On-disk cache of per-package bootstrap results.
+
+    Each entry is keyed by the package name and a content hash of its
+    prediction column (together with the experimental column it is scored
+    against) within one Dataset group, plus the group name, metric,
+    n_bootstraps and seed. Packages whose predictions have not changed are
+    loaded instead of re-scored.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, data, xdata, ycol, package, group, metric, n_bootstraps, seed):
+        content = pd.util.hash_pandas_object(data[[xdata, ycol]], index=False).to_numpy()
+        h = hashlib.sha256(content.tobytes())
+        h.update(json.dumps([xdata, package, str(group), metric, n_bootstraps, seed]).encode('utf-8'))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        return pd.read_json(path, orient='records')
+
+    def put(self, key, df):
+        tmp_path = self._path(key) + '.tmp'
+        df.to_json(tmp_path, orient='records', double_precision=15)
+        os.replace(tmp_path, self._path(key))
+
+
+def score_packages_with_cache(calculate_metric, data, xdata, ydata, group, package_list,
+                              cache, n_bootstraps=10, metric='spearman', seed=0):
+    """
+    Score each package in one Dataset group, reusing cached results where possible.
+
+    Packages are scored one at a time with the random state reset to `seed`,
+    so every package sees the same bootstrap resamples and a cached package's
+    results line up with freshly scored ones.
+
+    Parameters:
+    -----------
+    calculate_metric : callable
+        eternabench.stats.calculate_metric
+    data : DataFrame
+        Rows for this Dataset group
+    xdata, ydata : str
+        Experimental column and prediction column prefix (e.g. 'log_kfold_est_nolig_Z')
+    group : str
+        Dataset group name (part of the cache key)
+    package_list : list of str
+        Packages to score
+    cache : ScoringCache
+
+    Returns:
+    --------
+    DataFrame of bootstrap results for all packages, and the number of packages scored fresh
+    """
+    frames = []
+    n_scored = 0
+    for package in package_list:
+        key = cache.key(data, xdata, ydata + '_' + package, package, group, metric, n_bootstraps, seed)
+        result = cache.get(key)
+        if result is None:
+            np.random.seed(seed)
+            result = calculate_metric(data, x_data=xdata, y_data=ydata, n_bootstraps=n_bootstraps,
+                                      package_list=[package], metric=metric)
+            cache.put(key, result)
+            n_scored += 1
+        result['package'] = package
+        frames.append(result)
+    return pd.concat(frames, ignore_index=True), n_scored
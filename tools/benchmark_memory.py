@@ -0,0 +1,82 @@
+import argparse
+import time
+import torch
+try:
+    from .model import build_model
+except ImportError:
+    from model import build_model
+
+
+def profile_memory(model, lengths, device='cuda', seed=0):
+    """
+    Peak inference memory vs. sequence length for finetuned_RibonanzaNet.
+
+    Each length is scored once with a random ACGU sequence under torch.no_grad
+    (as in stream_from_checkpoint). Peak memory is measured with
+    torch.cuda.max_memory_allocated, so a CUDA device is needed for memory
+    numbers (on CPU only timings are reported). The size of one fp32
+    [L, L, 64] pairwise map is listed alongside for reference.
+
+    Args:
+        model: finetuned_RibonanzaNet instance
+        lengths: Sequence lengths to profile
+        device: Device to run on
+        seed: Random seed for the test sequences
+
+    Returns:
+        List of dicts with 'length', 'peak_mem_mb', 'pairwise_map_mb' and 'time_s'
+    """
+    model = model.to(device)
+    model.eval()
+    generator = torch.Generator().manual_seed(seed)
+    use_cuda = torch.device(device).type == 'cuda'
+    rows = []
+
+    for length in lengths:
+        src = torch.randint(0, 4, (1, length), generator=generator).to(device)
+        if use_cuda:
+            torch.cuda.empty_cache()
+            torch.cuda.synchronize()
+            torch.cuda.reset_peak_memory_stats()
+            base = torch.cuda.memory_allocated()
+        start = time.perf_counter()
+        try:
+            with torch.no_grad():
+                model(src)
+            if use_cuda:
+                torch.cuda.synchronize()
+            peak = (torch.cuda.max_memory_allocated() - base) / 2**20 if use_cuda else float('nan')
+        except torch.cuda.OutOfMemoryError:
+            peak = float('inf')
+        rows.append({'length': length, 'peak_mem_mb': peak,
+                     'pairwise_map_mb': length * length * 64 * 4 / 2**20,
+                     'time_s': time.perf_counter() - start})
+
+    return rows
+
+
+if __name__ == '__main__':
+
+    p = argparse.ArgumentParser(description="""Memory-vs-length profile of finetuned_RibonanzaNet inference""")
+
+    p.add_argument("--config", action='store', required=True, help='RibonanzaNet YAML config (e.g. configs/pairwise.yaml)')
+    p.add_argument("--network_dir", action='store', default=None, help='Directory containing Network.py (default $RNETEB_PATH/ribonanzanet2d-final)')
+    p.add_argument("--lengths", action='store', type=int, nargs='+', default=[64, 128, 256, 512, 1024])
+    p.add_argument("--device", action='store', default='cuda')
+    p.add_argument("-o", action="store", dest='outfile', help='Optional CSV for the profile')
+    args = p.parse_args()
+
+    model = build_model(args.config, network_dir=args.network_dir)
+    rows = profile_memory(model, args.lengths, device=args.device)
+
+    print(f"{'length':>8} {'peak MB':>10} {'map MB':>10} {'time s':>8}")
+    for row in rows:
+        print(f"{row['length']:>8} {row['peak_mem_mb']:>10.1f} {row['pairwise_map_mb']:>10.1f} {row['time_s']:>8.3f}")
+
+    if args.outfile:
+        import csv
+        with open(args.outfile, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nProfile saved to: {args.outfile}")
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Plotting/analysis modules the scoring path must not import
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'pandas', 'sklearn', 'Bio']
+
+# Each snippet times its own imports, so interpreter startup is excluded
+TORCH_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import torch
+print(json.dumps({'time': time.perf_counter() - start}))
+"""
+
+SCORING_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from model import build_model
+from streaming import stream_from_checkpoint
+elapsed = time.perf_counter() - start
+print(json.dumps({'time': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def time_snippet(snippet, repeats):
+    """
+    Run snippet in fresh interpreters and return the median self-reported import time.
+
+    Returns:
+        median_time: Median of the 'time' values printed by the snippet (seconds)
+        last: Last parsed JSON result
+    """
+    times = []
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, '-c', snippet], cwd=TOOLS_DIR,
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        last = json.loads(proc.stdout.strip().splitlines()[-1])
+        times.append(last['time'])
+    return statistics.median(times), last
+
+
+def run_benchmark(budget=0.2, repeats=5):
+    """
+    Check that the scoring path imports within budget and loads no plotting/analysis modules.
+
+    The scoring path is what rnet-eb-predict imports before it starts scoring
+    (model.build_model and streaming.stream_from_checkpoint). Its import time
+    is compared against a bare `import torch`, which it cannot avoid.
+
+    Args:
+        budget: Maximum allowed median import overhead over `import torch`, in seconds
+        repeats: Number of fresh-interpreter runs per measurement
+
+    Returns:
+        True if both checks pass
+    """
+    try:
+        torch_time, _ = time_snippet(TORCH_SNIPPET, repeats)
+        scoring_time, result = time_snippet(SCORING_SNIPPET % (HEAVY_MODULES,), repeats)
+    except RuntimeError as e:
+        print(f"FAIL: {e}")
+        return False
+
+    if result['loaded']:
+        print(f"FAIL: scoring path eagerly imported: {', '.join(result['loaded'])}")
+        return False
+
+    overhead = scoring_time - torch_time
+    print(f"import torch:          {torch_time * 1000:.1f} ms")
+    print(f"scoring path imports:  {scoring_time * 1000:.1f} ms")
+    print(f"Overhead over torch:   {overhead * 1000:.1f} ms (budget {budget * 1000:.0f} ms)")
+
+    if overhead > budget:
+        print("FAIL: import overhead over budget")
+        return False
+    print("PASS")
+    return True
+
+
+if __name__ == '__main__':
+
+    p = argparse.ArgumentParser(description="""Startup-time benchmark for the inference CLI scoring path""")
+
+    p.add_argument("--budget", action='store', type=float, default=0.2, help='Import overhead budget over `import torch` in seconds (default: 0.2)')
+    p.add_argument("--repeats", action='store', type=int, default=5)
+    args = p.parse_args()
+
+    sys.exit(0 if run_benchmark(budget=args.budget, repeats=args.repeats) else 1)
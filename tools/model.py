@@ -0,0 +1,92 @@
+import os
+import sys
+from functools import lru_cache
+
+
+class Config:
+    def __init__(self, **entries):
+        self.__dict__.update(entries)
+        self.entries=entries
+
+    def print(self):
+        print(self.entries)
+
+
+@lru_cache(maxsize=None)
+def load_config_from_yaml(file_path):
+    """
+    Parse a RibonanzaNet YAML config (cached, so repeated calls do not re-read the file).
+    """
+    import yaml
+    with open(file_path, 'r') as file:
+        config = yaml.safe_load(file)
+    return Config(**config)
+
+
+def default_network_dir():
+    return os.path.join(os.environ['RNETEB_PATH'], 'ribonanzanet2d-final')
+
+
+@lru_cache(maxsize=None)
+def finetuned_model_class(network_dir=None):
+    """
+    Build the finetuned_RibonanzaNet class on top of RibonanzaNet from `Network.py`.
+
+    Network.py lives in the RibonanzaNet repository (network_dir, default
+    $RNETEB_PATH/ribonanzanet2d-final), so it and torch are only imported here.
+    """
+    import torch
+    import torch.nn as nn
+
+    network_dir = network_dir or default_network_dir()
+    if network_dir not in sys.path:
+        sys.path.append(network_dir)
+    from Network import RibonanzaNet
+
+    class finetuned_RibonanzaNet(RibonanzaNet):
+        def __init__(self, config, pretrained=False):
+            super(finetuned_RibonanzaNet, self).__init__(config)
+            if pretrained:
+                self.load_state_dict(torch.load(os.environ['RNETEB_PATH']+'/ribonanzanet-weights/RibonanzaNet.pt',map_location='cpu'))
+
+            self.global_pool = nn.AdaptiveAvgPool2d(1)
+            self.decoder = nn.Linear(64, 2)  # From 64 "pooled values from each channel " to 2 output labels
+
+        def forward(self,src):
+
+            sequence_features, pairwise_features=self.get_embeddings(src, torch.ones_like(src).long().to(src.device))
+            pairwise_features = pairwise_features.squeeze(0)  # Remove the batch dimension to make it [H, W, 64]
+            pairwise_features = pairwise_features.permute(2, 0, 1)  # Change to [64, H, W] to match pooling expectation (C, H, W)
+
+            # Apply global average pooling, result is [64, 1, 1]
+            pairwise_features = self.global_pool(pairwise_features)
+
+            # Flatten the output to [64]
+            pairwise_features = pairwise_features.view(pairwise_features.size(0))  # Flatten to [64] (batch size 1, so this will be [64])
+
+            # Pass through the decoder to get the final output [2]
+            output = self.decoder(pairwise_features)
+
+            return output
+
+    return finetuned_RibonanzaNet
+
+
+def build_model(config_path, network_dir=None, pretrained=False):
+    """
+    Construct a fresh finetuned_RibonanzaNet instance from a YAML config.
+
+    The parsed config and the model class are cached, so repeated calls skip
+    re-reading the YAML and re-importing Network.py, but every call returns
+    a new model (callers load their own checkpoints into it).
+
+    Args:
+        config_path: Path to the YAML config (e.g. configs/pairwise.yaml)
+        network_dir: Directory containing Network.py (default $RNETEB_PATH/ribonanzanet2d-final)
+        pretrained: Whether to load the pretrained RibonanzaNet weights
+
+    Returns:
+        model: finetuned_RibonanzaNet instance (on CPU)
+    """
+    config = load_config_from_yaml(config_path)
+    return finetuned_model_class(network_dir)(config, pretrained=pretrained)
@@ -1,8 +1,9 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 import numpy as np
 
+# matplotlib and seaborn are imported inside each function so that importing
+# this module (e.g. from the inference CLI) does not pay their import cost.
+
 
 def plot_logkd_histograms(df, figsize=(14, 6), color1='#2E86AB', color2='#A23B72', bins=30):
     """
@@ -25,6 +26,8 @@ def plot_logkd_histograms(df, figsize=(14, 6), color1='#2E86AB', color2='#A23B72
     --------
     fig, axes : matplotlib figure and axes objects
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
   
     
     # Set the style to remove grid lines
@@ -78,6 +81,7 @@ def plot_loss_curve(train_losses, val_losses, figure_dir, filename='loss_curve')
         figure_dir: Directory to save figures
         filename: Base filename (without extension)
     """
+    import matplotlib.pyplot as plt
     # Set font to Times New Roman
     plt.rcParams['font.serif'] = ['Times New Roman']
     plt.rcParams['font.size'] = 14
@@ -134,6 +138,7 @@ def plot_final_summary(train_losses, val_losses, figure_dir, filename='final_los
         figure_dir: Directory to save figures
         filename: Base filename (without extension)
     """
+    import matplotlib.pyplot as plt
     # Set font to Times New Roman
     plt.rcParams['font.serif'] = ['Times New Roman']
     plt.rcParams['font.size'] = 14
@@ -204,6 +209,7 @@ def plot_prediction_comparison(test_data, model_name, save_dir=None, show_plots=
     Returns:
         dict: Dictionary containing correlation coefficients
     """
+    import matplotlib.pyplot as plt
     # Set matplotlib parameters for Times New Roman (no LaTeX)
     # Set font to Times New Roman
     plt.rcParams['font.serif'] = ['Times New Roman']
@@ -0,0 +1,42 @@
+import argparse
+
+# Only argparse is imported at module level: torch, the model and the
+# streaming reader are loaded inside main() once arguments are parsed, so
+# `rnet-eb-predict --help` and argument errors return immediately.
+
+
+def build_parser():
+    p = argparse.ArgumentParser(description="""Score a FASTA/JSON Lines design library with a RibonanzaNet-EB checkpoint""")
+
+    p.add_argument("checkpoint", action="store", help="Checkpoint saved by save_checkpoint")
+    p.add_argument("infile", action="store", help="FASTA (.fasta/.fa) or JSON Lines (.jsonl) input")
+    p.add_argument("-o", action="store", dest='outfile', required=True, help='Output JSON Lines file (or directory for --output_format parquet)')
+    p.add_argument("--config", action='store', required=True, help='RibonanzaNet YAML config (e.g. configs/pairwise.yaml)')
+    p.add_argument("--network_dir", action='store', default=None, help='Directory containing Network.py (default $RNETEB_PATH/ribonanzanet2d-final)')
+    p.add_argument("--model_name", action='store', default='RNet_EB', help='Suffix for the prediction columns')
+    p.add_argument("--input_format", action='store', default=None, help='fasta or jsonl (default: from extension)')
+    p.add_argument("--output_format", action='store', default='jsonl', help='jsonl or parquet')
+    p.add_argument("--chunk_size", action='store', type=int, default=1000)
+    p.add_argument("--device", action='store', default='cuda')
+    p.add_argument("--no_resume", action='store_true', help='Start over instead of resuming from the offset marker')
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        from .model import build_model
+        from .streaming import stream_from_checkpoint
+    except ImportError:
+        from model import build_model
+        from streaming import stream_from_checkpoint
+
+    model = build_model(args.config, network_dir=args.network_dir)
+    stream_from_checkpoint(args.checkpoint, args.infile, model, args.model_name, args.outfile,
+                           input_format=args.input_format, output_format=args.output_format,
+                           chunk_size=args.chunk_size, device=args.device, resume=not args.no_resume)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,4 @@
 import torch
-import pandas as pd
 import numpy as np
 from torch.utils.data import Dataset
 
@@ -0,0 +1,313 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+
+# 2-bit code per nucleotide; anything else (N, T, gaps) makes a sequence unpackable
+_CODES = np.full(256, 255, dtype=np.uint8)
+for _i, _nt in enumerate('ACGU'):
+    _CODES[ord(_nt)] = _i
+
+_MASK64 = (1 << 64) - 1
+_FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+_FNV_PRIME = np.uint64(0x100000001b3)
+
+
+def encode(sequence):
+    """
+    Convert an ACGU string to a uint8 array of 2-bit codes (A=0, C=1, G=2, U=3).
+
+    Raises:
+        ValueError if the sequence contains anything other than A, C, G, U
+    """
+    codes = _CODES[np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)]
+    if (codes == 255).any():
+        raise ValueError(f"Sequence contains non-ACGU characters: {sequence[:50]}")
+    return codes
+
+
+def pack(sequence):
+    """
+    Pack an ACGU string 2 bits per nucleotide (4 nucleotides per byte).
+
+    Returns:
+        bytes; together with the sequence length this is lossless (see unpack)
+    """
+    codes = encode(sequence)
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6 | quads[:, 1] << 4 | quads[:, 2] << 2 | quads[:, 3]).astype(np.uint8).tobytes()
+
+
+def unpack(packed, length):
+    """
+    Inverse of pack.
+    """
+    b = np.frombuffer(packed, dtype=np.uint8)
+    codes = np.stack([b >> 6, (b >> 4) & 3, (b >> 2) & 3, b & 3], axis=1).reshape(-1)[:length]
+    return ''.join('ACGU'[c] for c in codes)
+
+
+def _text_hash(sequence):
+    """
+    64-bit hash of the raw text, for sequences that cannot be packed (0 for missing values).
+    """
+    if not isinstance(sequence, str):
+        return 0
+    return int.from_bytes(hashlib.blake2b(sequence.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def hash_sequence(sequence):
+    """
+    64-bit FNV-1a hash of the packed sequence, salted with its length.
+
+    Sequences that cannot be packed (non-ACGU characters, missing values)
+    get a hash of their raw text instead, so every value has a key.
+    """
+    try:
+        packed = pack(sequence)
+    except (ValueError, AttributeError, UnicodeEncodeError):
+        return _text_hash(sequence)
+    h = 0xcbf29ce484222325
+    for byte in packed + len(sequence).to_bytes(4, 'little'):
+        h = ((h ^ byte) * 0x100000001b3) & _MASK64
+    return h
+
+
+def hash_sequences(sequences):
+    """
+    Vectorized 64-bit hashes for an iterable of sequences (same values as hash_sequence).
+
+    ACGU strings are grouped by length so each group is hashed as one 2-D
+    array; the rest (non-ACGU characters, NaN/None) fall back to hash_sequence.
+
+    Returns:
+        np.ndarray of uint64, one hash per sequence
+    """
+    sequences = np.asarray(list(sequences), dtype=object)
+    # Missing values get length -1 and are hashed one by one with the other unpackable rows
+    lengths = np.fromiter((len(s) if isinstance(s, str) else -1 for s in sequences),
+                          dtype=np.int64, count=len(sequences))
+    hashes = np.empty(len(sequences), dtype=np.uint64)
+    unpackable = [np.flatnonzero(lengths < 0)]
+
+    with np.errstate(over='ignore'):
+        for length in np.unique(lengths[lengths >= 0]):
+            idx = np.flatnonzero(lengths == length)
+            # errors='replace' keeps one byte per character; '?' is not ACGU
+            raw = np.frombuffer(''.join(sequences[idx]).encode('ascii', errors='replace'), dtype=np.uint8)
+            codes = _CODES[raw].reshape(len(idx), length)
+            bad = (codes == 255).any(axis=1)
+            if bad.any():
+                unpackable.append(idx[bad])
+                idx, codes = idx[~bad], codes[~bad]
+            n_bytes = -(-length // 4)
+            padded = np.zeros((len(idx), n_bytes * 4), dtype=np.uint8)
+            padded[:, :length] = codes
+            quads = padded.reshape(len(idx), n_bytes, 4)
+            packed = quads[..., 0] << 6 | quads[..., 1] << 4 | quads[..., 2] << 2 | quads[..., 3]
+            tail = np.frombuffer(int(length).to_bytes(4, 'little'), dtype=np.uint8)
+            data = np.concatenate([packed, np.broadcast_to(tail, (len(idx), 4))], axis=1)
+
+            h = np.full(len(idx), _FNV_OFFSET, dtype=np.uint64)
+            for col in data.T:
+                h = (h ^ col.astype(np.uint64)) * _FNV_PRIME
+            hashes[idx] = h
+
+    for i in np.concatenate(unpackable):
+        hashes[i] = _text_hash(sequences[i])
+    return hashes
+
+
+class SequenceIndex:
+    """
+    Hash index over the 'sequence' column of a dataframe.
+
+    Sequences are keyed by a 64-bit hash of their 2-bit packed form, so
+    lookups, joins and duplicate grouping compare uint64 keys instead of
+    Python strings. Hash collisions are checked against the original
+    strings wherever rows are matched. Values that cannot be packed (NaN,
+    non-ACGU characters) are keyed by a hash of their text instead, so they
+    match the same rows they would in pd.merge.
+
+    Example:
+        train_idx = SequenceIndex(train_df)
+        test_df = test_df[~SequenceIndex(test_df).isin(train_idx)]
+        merged = SequenceIndex(eb_rs_data).merge(train_df)
+    """
+
+    def __init__(self, df, sequence_col='sequence'):
+        self.df = df
+        self.sequence_col = sequence_col
+        self.keys = hash_sequences(df[sequence_col])
+        self._seqs = df[sequence_col].to_numpy()
+
+        # Rows grouped by key: rows sharing key k are _order[_starts[g]:_starts[g] + _counts[g]]
+        # with g = _groups[k], so a lookup is one dict access plus a slice
+        self._uniq, inverse, self._counts = np.unique(self.keys, return_inverse=True, return_counts=True)
+        self._order = np.argsort(inverse, kind='stable')
+        self._starts = np.concatenate([[0], np.cumsum(self._counts)[:-1]]).astype(np.int64)
+        self._groups = dict(zip(self._uniq.tolist(), range(len(self._uniq))))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, sequence):
+        """
+        Positional row indices of `sequence` in the indexed dataframe (empty if absent).
+        """
+        g = self._groups.get(hash_sequence(sequence))
+        if g is None:
+            return np.array([], dtype=np.int64)
+        rows = self._order[self._starts[g]:self._starts[g] + self._counts[g]]
+        return rows[self._seqs[rows] == sequence]
+
+    def __contains__(self, sequence):
+        return len(self.lookup(sequence)) > 0
+
+    def isin(self, other):
+        """
+        Boolean mask of rows whose sequence also appears in `other` (a SequenceIndex).
+
+        Vectorized replacement for df['sequence'].isin(other_df['sequence']).
+        """
+        mask = np.isin(self.keys, other.keys)
+        cand = np.flatnonzero(mask)
+
+        # Compare each candidate with the first row of its key group in `other`;
+        # only a hash collision can make them differ, and those are checked in full
+        g = np.searchsorted(other._uniq, self.keys[cand])
+        first = other._seqs[other._order[other._starts[g]]]
+        for i in cand[self._seqs[cand] != first]:
+            mask[i] = len(other.lookup(self._seqs[i])) > 0
+        return mask
+
+    def merge(self, other_df, how='inner', other_sequence_col='sequence', **kwargs):
+        """
+        Join the indexed dataframe with other_df on sequence via the 64-bit keys.
+
+        Equivalent to pd.merge(self.df, other_df, on='sequence', how=how), but
+        the join itself runs on uint64 columns.
+        """
+        left = self.df.assign(_seq_key=self.keys)
+        right = other_df.assign(_seq_key=hash_sequences(other_df[other_sequence_col]))
+        right = right.rename(columns={other_sequence_col: '_seq_right'})
+        merged = pd.merge(left, right, on='_seq_key', how=how, **kwargs)
+
+        # Drop hash collisions, then fill in sequences for rows only present on the right
+        both = merged[self.sequence_col].notna() & merged['_seq_right'].notna()
+        merged = merged[~both | (merged[self.sequence_col] == merged['_seq_right'])]
+        merged[self.sequence_col] = merged[self.sequence_col].fillna(merged['_seq_right'])
+        return merged.drop(columns=['_seq_key', '_seq_right']).reset_index(drop=True)
+
+    def duplicate_groups(self, min_size=2):
+        """
+        Group rows that share a sequence (e.g. the same design measured under several conditions).
+
+        Returns:
+            DataFrame with 'sequence', 'n_rows' and 'rows' (positional indices) per duplicated sequence
+        """
+        groups = []
+        for g in np.flatnonzero(self._counts >= min_size):
+            rows = self._order[self._starts[g]:self._starts[g] + self._counts[g]]
+            seqs = self._seqs[rows]
+            if (seqs == seqs[0]).all():
+                groups.append(rows)
+            else:
+                # Hash collision: split the bucket by the actual strings
+                for seq in pd.unique(seqs):
+                    sub = rows[seqs == seq]
+                    if len(sub) >= min_size:
+                        groups.append(sub)
+        return pd.DataFrame({'sequence': [self._seqs[r[0]] for r in groups],
+                             'n_rows': [len(r) for r in groups],
+                             'rows': groups})
+
+
+def _kmer_signatures(sequences, n_bands):
+    """
+    Split every sequence into n_bands contiguous k-mer bands (k ~ L / n_bands).
+
+    Two equal-length sequences within Hamming distance d < n_bands share at
+    least n_bands - d identical bands (pigeonhole), so candidate near-duplicate
+    pairs are exactly those sharing a (length, band, k-mer) signature.
+    """
+    signatures = []
+    for i, s in enumerate(sequences):
+        if not isinstance(s, str):
+            continue
+        L = len(s)
+        if L < n_bands:
+            continue
+        bounds = np.linspace(0, L, n_bands + 1).astype(int)
+        for b in range(n_bands):
+            signatures.append((L, b, s[bounds[b]:bounds[b + 1]], i))
+    return pd.DataFrame(signatures, columns=['length', 'band', 'kmer', 'row'])
+
+
+def _hamming(a, b):
+    return int((np.frombuffer(a.encode('ascii', errors='replace'), dtype=np.uint8)
+                != np.frombuffer(b.encode('ascii', errors='replace'), dtype=np.uint8)).sum())
+
+
+def leakage_report(splits, max_hamming=0):
+    """
+    Report sequences shared between data splits, optionally including near duplicates.
+
+    Args:
+        splits: Dict mapping split name -> dataframe with a 'sequence' column,
+                e.g. {'train': train_df, 'val': val_df, 'test': test_df}
+        max_hamming: Also report equal-length pairs within this Hamming distance
+                     (0 reports exact matches only)
+
+    Returns:
+        DataFrame with one row per leaking pair:
+        'split_a', 'row_a', 'split_b', 'row_b', 'hamming'
+    """
+    names = list(splits)
+    indices = {name: SequenceIndex(splits[name]) for name in names}
+    report = []
+
+    # Exact matches via the 64-bit keys
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            left = pd.DataFrame({'key': indices[a].keys, 'row_a': np.arange(len(indices[a]))})
+            right = pd.DataFrame({'key': indices[b].keys, 'row_b': np.arange(len(indices[b]))})
+            pairs = left.merge(right, on='key')
+            seq_a = splits[a]['sequence'].to_numpy()[pairs['row_a'].to_numpy()]
+            seq_b = splits[b]['sequence'].to_numpy()[pairs['row_b'].to_numpy()]
+            pairs = pairs[seq_a == seq_b]
+            report.append(pd.DataFrame({'split_a': a, 'row_a': pairs['row_a'].to_numpy(),
+                                        'split_b': b, 'row_b': pairs['row_b'].to_numpy(),
+                                        'hamming': 0}))
+
+    # Near duplicates via shared band signatures, verified by exact Hamming distance
+    if max_hamming > 0:
+        n_bands = max_hamming + 1
+        sigs = {}
+        for name in names:
+            seqs = splits[name]['sequence'].to_numpy()
+            sig = _kmer_signatures(seqs, n_bands=n_bands)
+            sigs[name] = sig
+        for i, a in enumerate(names):
+            for b in names[i + 1:]:
+                cand = sigs[a].merge(sigs[b], on=['length', 'band', 'kmer'], suffixes=('_a', '_b'))
+                cand = cand[['row_a', 'row_b']].drop_duplicates()
+                seq_a = splits[a]['sequence'].to_numpy()
+                seq_b = splits[b]['sequence'].to_numpy()
+                dist = np.array([_hamming(seq_a[ra], seq_b[rb])
+                                 for ra, rb in zip(cand['row_a'], cand['row_b'])], dtype=int)
+                keep = (dist > 0) & (dist <= max_hamming)
+                report.append(pd.DataFrame({'split_a': a, 'row_a': cand['row_a'].to_numpy()[keep],
+                                            'split_b': b, 'row_b': cand['row_b'].to_numpy()[keep],
+                                            'hamming': dist[keep]}))
+
+    if not report:
+        report = [pd.DataFrame({'split_a': pd.Series(dtype=object), 'row_a': pd.Series(dtype=np.int64),
+                                'split_b': pd.Series(dtype=object), 'row_b': pd.Series(dtype=np.int64),
+                                'hamming': pd.Series(dtype=np.int64)})]
+    report = pd.concat(report, ignore_index=True)
+    print(f"Leakage report: {(report['hamming'] == 0).sum()} exact and "
+          f"{(report['hamming'] > 0).sum()} near-duplicate pairs across {len(names)} splits")
+    return report
@@ -0,0 +1,324 @@
+import torch
+import json
+import os
+import queue
+import threading
+from itertools import islice
+from tqdm import tqdm
+
+
+TOKENS = {nt: i for i, nt in enumerate('ACGU')}
+FASTA_EXTENSIONS = ('.fasta', '.fa', '.fna')
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+
+
+def read_fasta(path):
+    """
+    Lazily yield records from a FASTA file, one at a time.
+
+    Args:
+        path: Path to the FASTA file
+
+    Yields:
+        dict with 'id', 'description' and 'sequence' keys (same layout as the
+        records built with SeqIO in the data-prep notebook)
+    """
+    header = None
+    seq_lines = []
+    with open(path, 'r') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('>'):
+                if header is not None:
+                    yield {'id': header.split()[0], 'description': header,
+                           'sequence': ''.join(seq_lines)}
+                header = line[1:]
+                seq_lines = []
+            else:
+                seq_lines.append(line)
+    if header is not None:
+        yield {'id': header.split()[0], 'description': header,
+               'sequence': ''.join(seq_lines)}
+
+
+def read_jsonl(path):
+    """
+    Lazily yield records from a JSON Lines file (one JSON object per line).
+
+    Args:
+        path: Path to the JSON Lines file
+
+    Yields:
+        dict for each non-empty line; must contain a 'sequence' key
+    """
+    with open(path, 'r') as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_records(input_path, input_format=None):
+    """
+    Pick a lazy reader for input_path based on input_format or file extension.
+
+    Args:
+        input_path: Path to a FASTA or JSON Lines file
+        input_format: 'fasta' or 'jsonl' (if None, inferred from extension)
+
+    Returns:
+        Generator of record dicts
+    """
+    if input_format is None:
+        ext = os.path.splitext(input_path)[1].lower()
+        if ext in FASTA_EXTENSIONS:
+            input_format = 'fasta'
+        elif ext in JSONL_EXTENSIONS:
+            input_format = 'jsonl'
+        else:
+            raise ValueError(f"Cannot infer input format from extension '{ext}', "
+                             f"pass input_format='fasta' or 'jsonl'")
+
+    if input_format == 'fasta':
+        return read_fasta(input_path)
+    if input_format == 'jsonl':
+        return read_jsonl(input_path)
+    raise ValueError(f"Unknown input_format '{input_format}', must be 'fasta' or 'jsonl'")
+
+
+class PrefetchQueue:
+    """
+    Tokenize records on a background thread into a bounded queue.
+
+    At most max_prefetch tokenized records are held at any time, so memory
+    stays constant no matter how large the input library is. `start` is the
+    number of input records skipped before `records`, used to number records
+    in error messages.
+    """
+    _DONE = object()
+
+    def __init__(self, records, max_prefetch=64, start=0):
+        self.records = records
+        self.start = start
+        self.queue = queue.Queue(maxsize=max_prefetch)
+        self.error = None
+        self.thread = threading.Thread(target=self._produce, daemon=True)
+        self.thread.start()
+
+    def _produce(self):
+        try:
+            for n, record in enumerate(self.records, start=self.start + 1):
+                sequence = record['sequence']
+                try:
+                    sequence = torch.tensor([TOKENS[nt] for nt in sequence])
+                except KeyError as e:
+                    raise ValueError(f"Record {record.get('id', n)} (input record {n}) contains "
+                                     f"non-ACGU base {e.args[0]!r}") from None
+                self.queue.put((record, sequence))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is self._DONE:
+                break
+            yield item
+        if self.error is not None:
+            raise self.error
+
+
+class ChunkedPredictionWriter:
+    """
+    Write prediction rows to disk in fixed-size chunks with a resumable offset marker.
+
+    Rows are buffered until chunk_size is reached, then appended to the output
+    (a JSON Lines file, or one Parquet file per chunk so each chunk is its own
+    row group) and the marker file '<output_path>.offset.json' is atomically
+    updated with the number of input records fully written. The marker also
+    stores run_info (checkpoint, input file, model name), and resume() refuses
+    to continue output written by a different run.
+    """
+
+    def __init__(self, output_path, output_format='jsonl', chunk_size=1000, run_info=None):
+        if output_format not in ('jsonl', 'parquet'):
+            raise ValueError(f"Unknown output_format '{output_format}', must be 'jsonl' or 'parquet'")
+        self.output_path = output_path
+        self.output_format = output_format
+        self.chunk_size = chunk_size
+        self.marker_path = output_path + '.offset.json'
+        self.run_info = run_info
+        self.buffer = []
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.byte_offset = 0
+
+    def resume(self):
+        """
+        Load the offset marker (if any) and drop anything written after it.
+
+        Returns:
+            Number of input records already written (0 for a fresh run)
+
+        Raises:
+            ValueError if the marker was written with different run_info
+        """
+        if os.path.exists(self.marker_path):
+            with open(self.marker_path, 'r') as f:
+                marker = json.load(f)
+            previous = marker.get('run_info') or {}
+            if self.run_info is not None and previous != self.run_info:
+                changed = [k for k in self.run_info if previous.get(k) != self.run_info[k]]
+                raise ValueError(f"{self.output_path} was written by a different run "
+                                 f"(changed: {', '.join(changed)}). Use another output path "
+                                 f"or start over with resume=False (--no_resume)")
+            self.rows_written = marker['rows_written']
+            self.chunks_written = marker['chunks_written']
+            self.byte_offset = marker.get('byte_offset', 0)
+
+        if self.output_format == 'jsonl':
+            if os.path.exists(self.output_path):
+                # Discard a partially written chunk from an interrupted run
+                with open(self.output_path, 'r+b') as f:
+                    f.truncate(self.byte_offset)
+        else:
+            os.makedirs(self.output_path, exist_ok=True)
+        return self.rows_written
+
+    def reset(self):
+        """
+        Remove any previous output and offset marker to start a fresh run.
+
+        Returns:
+            0 (number of input records already written)
+        """
+        if self.output_format == 'jsonl':
+            if os.path.exists(self.output_path):
+                os.remove(self.output_path)
+        else:
+            os.makedirs(self.output_path, exist_ok=True)
+            for name in os.listdir(self.output_path):
+                if name.startswith('part-') and name.endswith('.parquet'):
+                    os.remove(os.path.join(self.output_path, name))
+        if os.path.exists(self.marker_path):
+            os.remove(self.marker_path)
+        return 0
+
+    def write(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        if self.output_format == 'jsonl':
+            with open(self.output_path, 'ab') as f:
+                for row in self.buffer:
+                    f.write((json.dumps(row) + '\n').encode('utf-8'))
+                self.byte_offset = f.tell()
+        else:
+            import pandas as pd
+            part_path = os.path.join(self.output_path, f'part-{self.chunks_written:05d}.parquet')
+            pd.DataFrame(self.buffer).to_parquet(part_path, index=False)
+
+        self.rows_written += len(self.buffer)
+        self.chunks_written += 1
+        self.buffer = []
+
+        marker = {'rows_written': self.rows_written,
+                  'chunks_written': self.chunks_written,
+                  'byte_offset': self.byte_offset,
+                  'run_info': self.run_info}
+        tmp_path = self.marker_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(marker, f)
+        os.replace(tmp_path, self.marker_path)
+
+
+def _file_info(path):
+    """
+    Absolute path, size and modification time of a file (identifies it in offset markers).
+    """
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def stream_from_checkpoint(checkpoint_path, input_path, model, model_name, output_path,
+                           input_format=None, output_format='jsonl', chunk_size=1000,
+                           max_prefetch=64, device='cuda', resume=True):
+    """
+    Load a model checkpoint and score a FASTA/JSON Lines library without holding it in memory.
+
+    Sequences are read lazily, tokenized into a bounded prefetch queue and
+    predictions are written incrementally in chunks. If the run dies partway,
+    calling this again with resume=True skips the records already written.
+    Resuming output written with a different checkpoint, input file or
+    model_name raises a ValueError instead of mixing predictions.
+
+    Args:
+        checkpoint_path: Path to the saved checkpoint file
+        input_path: FASTA or JSON Lines file with one sequence per record
+        model: Model instance (architecture should match checkpoint)
+        model_name: Name used for the prediction columns
+        output_path: JSON Lines file, or directory of Parquet chunks
+        input_format: 'fasta' or 'jsonl' (if None, inferred from extension)
+        output_format: 'jsonl' or 'parquet'
+        chunk_size: Number of predictions written per chunk
+        max_prefetch: Maximum number of tokenized sequences queued ahead of the model
+        device: Device to run inference on ('cuda' or 'cpu')
+        resume: Whether to continue from an existing offset marker
+
+    Returns:
+        rows_written: Total number of predictions on disk
+    """
+
+    # Check the output belongs to this run before loading the model
+    run_info = {'checkpoint': _file_info(checkpoint_path), 'input': _file_info(input_path),
+                'model_name': model_name}
+    writer = ChunkedPredictionWriter(output_path, output_format=output_format,
+                                     chunk_size=chunk_size, run_info=run_info)
+    start = writer.resume() if resume else writer.reset()
+    if start > 0:
+        print(f"Resuming after {start} already scored records")
+
+    # Load checkpoint
+    print(f"Loading checkpoint from: {checkpoint_path}")
+    checkpoint = torch.load(checkpoint_path, map_location=device)
+    model.load_state_dict(checkpoint['model_state_dict'])
+    model = model.to(device)
+    model.eval()
+    del checkpoint
+
+    records = islice(iter_records(input_path, input_format), start, None)
+    prefetch = PrefetchQueue(records, max_prefetch=max_prefetch, start=start)
+
+    # Run inference
+    print("Running streaming inference...")
+    tbar = tqdm(prefetch, desc="Scoring", initial=start)
+
+    with torch.no_grad():
+        for record, sequence in tbar:
+            output = model(sequence.unsqueeze(0).to(device))
+            output = output.cpu().numpy()
+
+            # Index 0 is logkd_lig_pred, Index 1 is logkd_no_lig_pred
+            row = dict(record)
+            row[f'log_kfold_est_lig_Z_{model_name}'] = float(output[0])
+            row[f'log_kfold_est_nolig_Z_{model_name}'] = float(output[1])
+            writer.write(row)
+
+    writer.flush()
+
+    print(f"\n{'='*60}")
+    print(f"Streaming Complete!")
+    print(f"Total scored records: {writer.rows_written}")
+    print(f"Predictions saved to: {output_path}")
+    print(f"{'='*60}\n")
+
+    return writer.rows_written
@@ -0,0 +1,271 @@
+import argparse
+import importlib
+import itertools
+import json
+import os
+import queue
+import random
+import numpy as np
+import pandas as pd
+import torch.multiprocessing as mp
+import yaml
+
+
+def load_yaml(file_path):
+    with open(file_path, 'r') as file:
+        return yaml.safe_load(file)
+
+
+def _to_python(value):
+    """
+    Convert numpy scalars to plain Python values so trial configs can be dumped with yaml.safe_dump.
+    """
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def expand_search_space(base_config, space, n_trials=None, seed=0):
+    """
+    Expand a search space over config fields into a list of trial configs.
+
+    Args:
+        base_config: Dict of default config values (e.g. a loaded RibonanzaNet YAML)
+        space: Dict mapping config field -> list of candidate values, e.g.
+               {'learning_rate': [1e-4, 3e-4], 'weight_decay': [1e-3, 1e-4]}
+        n_trials: If given, randomly sample this many configs from the grid
+                  instead of running the full grid
+        seed: Random seed for sampling
+
+    Returns:
+        List of dicts (base_config updated with the trial's values)
+    """
+    fields = sorted(space)
+    grid = list(itertools.product(*[space[f] for f in fields]))
+    if n_trials is not None and n_trials < len(grid):
+        grid = random.Random(seed).sample(grid, n_trials)
+
+    trials = []
+    for values in grid:
+        config = dict(base_config)
+        config.update({f: _to_python(v) for f, v in zip(fields, values)})
+        trials.append(config)
+    return trials
+
+
+class SuccessiveHalving:
+    """
+    Asynchronous successive halving (ASHA) early-stopping rule.
+
+    Rungs sit at min_epochs * reduction_factor**k epochs. When a trial reaches
+    a rung it keeps training only if its validation loss is within the best
+    1/reduction_factor of the losses already recorded at that rung.
+    """
+
+    def __init__(self, max_epochs, min_epochs=1, reduction_factor=3):
+        self.reduction_factor = reduction_factor
+        self.rungs = []
+        rung = min_epochs
+        while rung < max_epochs:
+            self.rungs.append(rung)
+            rung *= reduction_factor
+        self.rung_losses = {rung: [] for rung in self.rungs}
+
+    def report(self, epoch, val_loss):
+        """
+        Record a trial's validation loss after `epoch` (0-indexed).
+
+        Returns:
+            True if the trial should continue, False if it should be stopped
+        """
+        epochs_done = epoch + 1
+        if epochs_done not in self.rung_losses:
+            return True
+
+        losses = self.rung_losses[epochs_done]
+        losses.append(val_loss)
+        if len(losses) < self.reduction_factor:
+            return True
+        cutoff = np.quantile(losses, 1 / self.reduction_factor)
+        return val_loss <= cutoff
+
+
+def _sweep_worker(worker_id, train_fn, jobs, messages, replies):
+    """
+    Worker loop: pull trials off the job queue and run train_fn on each.
+    """
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        trial_id, config, trial_dir = job
+        messages.put(('start', worker_id, trial_id))
+
+        def report(epoch, train_loss, val_loss, checkpoint_path=None):
+            messages.put(('report', worker_id, trial_id, epoch, train_loss, val_loss, checkpoint_path))
+            return replies.get()
+
+        try:
+            os.makedirs(trial_dir, exist_ok=True)
+            with open(os.path.join(trial_dir, 'config.yaml'), 'w') as f:
+                yaml.safe_dump(config, f)
+            train_fn(config, trial_dir, report)
+            messages.put(('done', worker_id, trial_id, None))
+        except Exception as e:
+            messages.put(('done', worker_id, trial_id, repr(e)))
+
+
+def run_sweep(base_config, space, output_dir, train_fn=None, n_workers=1, n_trials=None,
+              min_epochs=1, reduction_factor=3, seed=0, devices=None, poll_interval=5.0):
+    """
+    Run a hyperparameter sweep on a pool of local workers with ASHA early stopping.
+
+    train_fn(config, trial_dir, report) trains one trial. It must call
+    report(epoch, train_loss, val_loss, checkpoint_path) after every epoch's
+    validation and stop training when report returns False. train_fn must be
+    picklable (defined in an importable module) since workers are spawned.
+    The default is training.train_trial, the tuning notebook's loop.
+
+    Args:
+        base_config: Dict of default config values
+        space: Dict mapping config field -> list of candidate values
+        output_dir: Directory for per-trial folders and the results table
+        train_fn: Training function (see above; default training.train_trial)
+        n_workers: Number of concurrent local worker processes
+        n_trials: Randomly sample this many configs from the grid (None runs the full grid)
+        min_epochs: Epochs before the first successive-halving rung
+        reduction_factor: Keep the best 1/reduction_factor of trials at each rung
+        seed: Random seed for trial sampling
+        devices: Optional list of devices assigned round-robin to trials as config['device']
+        poll_interval: Seconds between worker liveness checks while waiting for messages
+
+    Returns:
+        results: DataFrame with one row per trial (also saved to output_dir/sweep_results.csv)
+    """
+    if train_fn is None:
+        try:
+            from .training import train_trial
+        except ImportError:
+            from training import train_trial
+        train_fn = train_trial
+
+    os.makedirs(output_dir, exist_ok=True)
+    trials = expand_search_space(base_config, space, n_trials=n_trials, seed=seed)
+    max_epochs = max(config['epochs'] for config in trials)
+    scheduler = SuccessiveHalving(max_epochs, min_epochs=min_epochs, reduction_factor=reduction_factor)
+
+    ctx = mp.get_context('spawn')
+    jobs, messages = ctx.Queue(), ctx.Queue()
+    replies = [ctx.Queue() for _ in range(n_workers)]
+
+    records = {}
+    for trial_id, config in enumerate(trials):
+        if devices:
+            config['device'] = devices[trial_id % len(devices)]
+        trial_dir = os.path.join(output_dir, f'trial_{trial_id:03d}')
+        records[trial_id] = {'trial_id': trial_id, 'status': 'queued', 'epochs_run': 0,
+                             'train_losses': [], 'val_losses': [], 'best_val_loss': np.inf,
+                             'checkpoint_path': None, 'trial_dir': trial_dir, 'error': None,
+                             **{field: config[field] for field in sorted(space)}}
+        jobs.put((trial_id, config, trial_dir))
+    for _ in range(n_workers):
+        jobs.put(None)
+
+    workers = [ctx.Process(target=_sweep_worker, args=(i, train_fn, jobs, messages, replies[i]))
+               for i in range(n_workers)]
+    for w in workers:
+        w.start()
+
+    print(f"Running {len(trials)} trials on {n_workers} workers (rungs at epochs {scheduler.rungs})")
+    remaining = len(trials)
+    current = {}  # worker_id -> trial_id it is running
+    while remaining > 0:
+        try:
+            message = messages.get(timeout=poll_interval)
+        except queue.Empty:
+            # A worker that died without reporting (crash, OOM kill) fails its trial
+            for worker_id, w in enumerate(workers):
+                if not w.is_alive() and worker_id in current:
+                    trial_id = current.pop(worker_id)
+                    records[trial_id]['status'] = 'failed'
+                    records[trial_id]['error'] = f'worker exited with code {w.exitcode}'
+                    remaining -= 1
+                    print(f"Trial {trial_id} failed - worker {worker_id} exited with code {w.exitcode}")
+            if remaining > 0 and not any(w.is_alive() for w in workers):
+                for record in records.values():
+                    if record['status'] in ('queued', 'running'):
+                        record['status'] = 'failed'
+                        record['error'] = 'workers exited before the trial finished'
+                print(f"All workers exited; {remaining} trial(s) did not finish")
+                break
+            continue
+
+        kind, worker_id, trial_id = message[:3]
+        record = records[trial_id]
+
+        if kind == 'start':
+            record['status'] = 'running'
+            current[worker_id] = trial_id
+
+        elif kind == 'report':
+            epoch, train_loss, val_loss, checkpoint_path = message[3:]
+            record['epochs_run'] = epoch + 1
+            record['train_losses'].append(train_loss)
+            record['val_losses'].append(val_loss)
+            if val_loss < record['best_val_loss']:
+                record['best_val_loss'] = val_loss
+                if checkpoint_path is not None:
+                    record['checkpoint_path'] = checkpoint_path
+            keep_going = scheduler.report(epoch, val_loss)
+            if not keep_going:
+                record['status'] = 'stopped'
+                print(f"Trial {trial_id} stopped at epoch {epoch + 1} (val loss {val_loss:.4f})")
+            replies[worker_id].put(keep_going)
+
+        elif kind == 'done':
+            error = message[3]
+            if error is not None:
+                record['status'] = 'failed'
+                record['error'] = error
+            elif record['status'] == 'running':
+                record['status'] = 'completed'
+            current.pop(worker_id, None)
+            remaining -= 1
+            print(f"Trial {trial_id} {record['status']} - best val loss {record['best_val_loss']:.4f}")
+
+    for w in workers:
+        w.join()
+
+    results = pd.DataFrame(list(records.values()))
+    results['train_losses'] = results['train_losses'].apply(json.dumps)
+    results['val_losses'] = results['val_losses'].apply(json.dumps)
+    results = results.sort_values('best_val_loss').reset_index(drop=True)
+
+    results_path = os.path.join(output_dir, 'sweep_results.csv')
+    results.to_csv(results_path, index=False)
+    print(f"\nSweep results saved to: {results_path}")
+    return results
+
+
+if __name__ == '__main__':
+
+    p = argparse.ArgumentParser(description="""Run a local ASHA hyperparameter sweep over a RibonanzaNet YAML config""")
+
+    p.add_argument("config", action="store", help="Base YAML config (e.g. ribonanzanet-1/configs/pairwise.yaml)")
+    p.add_argument("space", action="store", help="YAML file mapping config fields to lists of candidate values")
+    p.add_argument("--train_fn", action="store", default=None, help="Training function as module:function (default: training:train_trial)")
+    p.add_argument("-o", action="store", dest='output_dir', default='sweep', help='Output directory (default: sweep)')
+    p.add_argument("--n_workers", action='store', type=int, default=1)
+    p.add_argument("--n_trials", action='store', type=int, default=None, help='Randomly sample this many configs from the grid')
+    p.add_argument("--min_epochs", action='store', type=int, default=1)
+    p.add_argument("--reduction_factor", action='store', type=int, default=3)
+    p.add_argument("--seed", action='store', type=int, default=0)
+    p.add_argument("--devices", action='store', nargs='+', default=None, help='Devices assigned round-robin, e.g. cuda:0 cuda:1')
+    args = p.parse_args()
+
+    train_fn = None
+    if args.train_fn is not None:
+        module_name, fn_name = args.train_fn.split(':')
+        train_fn = getattr(importlib.import_module(module_name), fn_name)
+
+    run_sweep(load_yaml(args.config), load_yaml(args.space), args.output_dir, train_fn=train_fn,
+              n_workers=args.n_workers, n_trials=args.n_trials, min_epochs=args.min_epochs,
+              reduction_factor=args.reduction_factor, seed=args.seed, devices=args.devices)
@@ -1,8 +1,10 @@
 import torch
-import pandas as pd
 from torch.utils.data import DataLoader
 from tqdm import tqdm
-from rna_datasets import RNA_Dataset
+try:
+    from .rna_datasets import RNA_Dataset
+except ImportError:
+    from rna_datasets import RNA_Dataset
 import os
 
 
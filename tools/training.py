@@ -34,4 +34,150 @@ def save_checkpoint(epoch, model, optimizer, schedule, avg_train_loss, val_loss,
     
     checkpoint_path = os.path.join(checkpoint_dir, checkpoint_name)
     torch.save(checkpoint, checkpoint_path)
-    return checkpoint_path
\ No newline at end of file
+    return checkpoint_path
+
+def train_trial(config, trial_dir, report):
+    """
+    Train one finetuned_RibonanzaNet trial (the tuning notebook's loop, driven by config).
+
+    Used as the default train_fn for sweep.run_sweep. Hyperparameters that the
+    notebook hard-codes are read from the config instead.
+
+    Args:
+        config: Dict of config values. Uses 'learning_rate', 'weight_decay',
+                'epochs' and 'cos_epoch' (default: epochs - 5), plus optional
+                'device' (default 'cuda'), 'seed' (default 0), 'pretrained'
+                (default True), 'network_dir', 'train_path' and 'val_path'
+                (default: the processed_data splits under $RNETEB_PATH).
+                With 'async_validation': True, epochs are validated by an
+                AsyncValidator while training continues, configured by
+                'val_every_n_epochs' (default 1), 'val_device' (default:
+                device) and 'val_subsample_frac' (default: full set). Only
+                validated epochs are reported, so align the cadence with
+                the sweep's rungs.
+        trial_dir: Directory for this trial's checkpoints
+        report: Callback report(epoch, train_loss, val_loss, checkpoint_path);
+                training stops early when it returns False
+
+    Returns:
+        best_loss: Best validation loss reached
+    """
+    import sys
+    import numpy as np
+    import pandas as pd
+    from torch.utils.data import DataLoader
+    try:
+        from .model import Config, finetuned_model_class
+        from .rna_datasets import RNA_Dataset
+        from .validation import AsyncValidator, run_validation
+    except ImportError:
+        from model import Config, finetuned_model_class
+        from rna_datasets import RNA_Dataset
+        from validation import AsyncValidator, run_validation
+
+    sys.path.append(os.environ['RANGER_PATH'] + '/ranger')
+    from ranger import Ranger
+
+    device = config.get('device', 'cuda')
+    epochs = config['epochs']
+    cos_epoch = config.get('cos_epoch', max(0, epochs - 5))
+    torch.manual_seed(config.get('seed', 0))
+    np.random.seed(config.get('seed', 0))
+
+    data_dir = os.path.join(os.environ.get('RNETEB_PATH', ''), 'data/processed_data')
+    train_df = pd.read_json(config.get('train_path', os.path.join(data_dir, 'RNET_EB_train.json')))
+    val_df = pd.read_json(config.get('val_path', os.path.join(data_dir, 'RNET_EB_val.json')))
+    train_loader = DataLoader(RNA_Dataset(train_df), batch_size=1, shuffle=True)
+
+    model_class = finetuned_model_class(config.get('network_dir'))
+    model = model_class(Config(**config), pretrained=config.get('pretrained', True)).to(device)
+
+    best_loss = np.inf
+    optimizer = Ranger(model.parameters(), weight_decay=config['weight_decay'], lr=config['learning_rate'])
+    criterion = torch.nn.L1Loss()
+    schedule = torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=max(1, (epochs - cos_epoch) * len(train_loader)))
+
+    train_losses = []
+    val_losses = []
+    best_path = None
+
+    validator = None
+    if config.get('async_validation', False):
+        validator = AsyncValidator(lambda: model_class(Config(**config)), val_df, criterion,
+                                   os.path.join(trial_dir, 'snapshots'),
+                                   best_checkpoint_path=os.path.join(trial_dir, 'best_checkpoint.pt'),
+                                   device=config.get('val_device', device),
+                                   every_n_epochs=config.get('val_every_n_epochs', 1),
+                                   subsample_frac=config.get('val_subsample_frac'))
+
+    def report_async(results):
+        # Report validated epochs in order; False as soon as the sweep stops the trial
+        for result in results:
+            val_losses.append(result['val_loss'])
+            best = validator.best_checkpoint_path if validator.best_epoch is not None else None
+            if not report(result['epoch'], train_losses[result['epoch']], result['val_loss'], best):
+                return False
+        return True
+
+    stopped = False
+    for epoch in range(epochs):
+        model.train()
+        total_loss = 0
+        for batch in train_loader:
+            sequence = batch['sequence'].to(device)
+            labels = batch['labels'].to(device)
+            output = model(sequence)
+            labels = labels.view_as(output)
+
+            loss = criterion(output, labels)
+            loss = loss.mean()
+
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(model.parameters(), 10)
+            optimizer.step()
+            optimizer.zero_grad()
+
+            if (epoch + 1) > cos_epoch:
+                schedule.step()
+
+            total_loss += loss.item()
+
+        avg_train_loss = total_loss / len(train_loader)
+        train_losses.append(avg_train_loss)
+
+        scheduler_to_save = schedule if (epoch + 1) > cos_epoch else None
+
+        if validator is not None:
+            validator.submit(epoch, model)
+            save_checkpoint(epoch, model, optimizer, scheduler_to_save,
+                            avg_train_loss, val_losses[-1] if val_losses else None,
+                            train_losses, val_losses, validator.best_loss, trial_dir,
+                            'latest_checkpoint.pt')
+            if not report_async(validator.poll()):
+                stopped = True
+                break
+            continue
+
+        val_loss, _ = run_validation(model, val_df, criterion, device)
+        val_losses.append(val_loss)
+
+        save_checkpoint(epoch, model, optimizer, scheduler_to_save,
+                        avg_train_loss, val_loss, train_losses, val_losses,
+                        best_loss, trial_dir, 'latest_checkpoint.pt')
+
+        if val_loss < best_loss:
+            best_loss = val_loss
+            best_path = save_checkpoint(epoch, model, optimizer, scheduler_to_save,
+                                        avg_train_loss, val_loss, train_losses, val_losses,
+                                        best_loss, trial_dir, 'best_checkpoint.pt')
+
+        if not report(epoch, avg_train_loss, val_loss, best_path):
+            break
+
+    if validator is not None:
+        remaining = validator.close()
+        if not stopped:
+            report_async(remaining)
+        best_loss = validator.best_loss
+
+    return best_loss
@@ -0,0 +1,270 @@
+import torch
+import numpy as np
+import os
+import queue
+import threading
+import torch.multiprocessing as mp
+from torch.utils.data import DataLoader
+try:
+    from .rna_datasets import RNA_Dataset
+except ImportError:
+    from rna_datasets import RNA_Dataset
+
+
+def stratified_subsample(val_df, frac=None, n=None, strata='Dataset', seed=0):
+    """
+    Draw a subsample of the validation set that keeps the proportion of each stratum.
+
+    Args:
+        val_df: Validation dataframe
+        frac: Fraction of rows to keep from every stratum
+        n: Total number of rows to keep (used if frac is None)
+        strata: Column to stratify over (e.g. 'Dataset')
+        seed: Random seed for reproducibility
+
+    Returns:
+        Subsampled dataframe with a fresh 0..N-1 index (RNA_Dataset indexes with .loc)
+    """
+    if frac is None and n is None:
+        return val_df.reset_index(drop=True)
+    if frac is None:
+        frac = min(1.0, n / len(val_df))
+
+    # At least one row per stratum so no Dataset drops out of validation. Columns are
+    # selected explicitly so apply keeps the strata column on every pandas version.
+    sample = val_df.groupby(strata, group_keys=False)[val_df.columns].apply(
+        lambda g: g.sample(n=max(1, int(round(len(g) * frac))), random_state=seed))
+    return sample.reset_index(drop=True)
+
+
+def run_validation(model, val_df, criterion, device='cuda', keep_preds=False):
+    """
+    Run a full validation pass (same loop as the training notebook).
+
+    Args:
+        model: Model with weights to evaluate
+        val_df: Validation dataframe
+        criterion: Loss function
+        device: Device to run on
+        keep_preds: Whether to return per-sample [labels, outputs] pairs
+
+    Returns:
+        val_loss: Average validation loss
+        val_preds: List of [labels, outputs] numpy pairs (None if keep_preds is False)
+    """
+    val_loader = DataLoader(RNA_Dataset(val_df), batch_size=1, shuffle=False)
+    model.eval()
+    val_preds = [] if keep_preds else None
+    val_loss = 0
+    with torch.no_grad():
+        for batch in val_loader:
+            sequence = batch['sequence'].to(device)
+            labels = batch['labels'].to(device)
+            output = model(sequence)
+            labels = labels.view_as(output)
+            loss = criterion(output, labels).mean()
+            val_loss += loss.item()
+            if keep_preds:
+                val_preds.append([labels.cpu().numpy(), output.cpu().numpy()])
+    return val_loss / len(val_loader), val_preds
+
+
+def _validation_worker(model_fn, device, val_df, criterion, keep_preds, jobs, results):
+    """
+    Worker loop: load each submitted weight snapshot and validate it.
+
+    Failures (including building the model) are reported through `results`
+    so the trainer never waits on a worker that has died.
+    """
+    try:
+        model = model_fn().to(device)
+    except Exception as e:
+        results.put({'epoch': None, 'val_loss': None, 'val_preds': None,
+                     'snapshot_path': None, 'error': repr(e)})
+        return
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        epoch, snapshot_path = job
+        try:
+            model.load_state_dict(torch.load(snapshot_path, map_location=device))
+            val_loss, val_preds = run_validation(model, val_df, criterion, device, keep_preds)
+            results.put({'epoch': epoch, 'val_loss': val_loss, 'val_preds': val_preds,
+                         'snapshot_path': snapshot_path, 'error': None})
+        except Exception as e:
+            results.put({'epoch': epoch, 'val_loss': None, 'val_preds': None,
+                         'snapshot_path': snapshot_path, 'error': repr(e)})
+
+
+class AsyncValidator:
+    """
+    Validate epoch-boundary weight snapshots in a separate worker while training continues.
+
+    At each epoch boundary call submit(epoch, model): the weights are saved to
+    snapshot_dir and handed to the worker (a thread, or a process with
+    worker='process'), which validates them on its own model copy on `device`
+    (e.g. a second GPU, 'cuda:1'). Call poll() to collect finished results;
+    best-checkpoint selection and early stopping are applied as they arrive.
+    The best checkpoint is written in the save_checkpoint layout ('epoch',
+    'model_state_dict', 'val_loss', 'best_loss'), so test_from_checkpoint and
+    stream_from_checkpoint can load it directly.
+
+    Example:
+        validator = AsyncValidator(lambda: finetuned_RibonanzaNet(config), val_df,
+                                   criterion, snapshot_dir, best_checkpoint_path,
+                                   device='cuda:1', every_n_epochs=2, patience=5)
+        for epoch in range(epochs):
+            ...  # training step
+            validator.submit(epoch, model)
+            for result in validator.poll():
+                val_losses.append(result['val_loss'])
+            if validator.should_stop:
+                break
+        validator.close()
+
+    With worker='process', model_fn must be picklable (defined in an importable
+    module, not a lambda or notebook class).
+    """
+
+    def __init__(self, model_fn, val_df, criterion, snapshot_dir, best_checkpoint_path=None,
+                 device='cuda', every_n_epochs=1, patience=None, subsample_frac=None,
+                 subsample_n=None, strata='Dataset', seed=0, keep_preds=False,
+                 worker='thread', keep_snapshots=False):
+        """
+        Args:
+            model_fn: Callable returning a fresh model instance (same architecture as training)
+            val_df: Validation dataframe
+            criterion: Loss function
+            snapshot_dir: Directory where epoch weight snapshots are written
+            best_checkpoint_path: Where the best snapshot is saved as a checkpoint (optional)
+            device: Device the worker validates on
+            every_n_epochs: Validation cadence; only every n-th epoch is submitted
+            patience: Stop after this many validated snapshots without improvement (None disables)
+            subsample_frac: Validate on a stratified fraction of val_df
+            subsample_n: Validate on a stratified subsample of this many rows
+            strata: Column used for stratified subsampling
+            seed: Random seed for subsampling
+            keep_preds: Whether results include per-sample [labels, outputs] pairs
+            worker: 'thread' or 'process'
+            keep_snapshots: Whether to keep snapshots after they are validated
+        """
+        self.snapshot_dir = snapshot_dir
+        self.best_checkpoint_path = best_checkpoint_path
+        self.every_n_epochs = every_n_epochs
+        self.patience = patience
+        self.keep_snapshots = keep_snapshots
+
+        self.best_loss = np.inf
+        self.best_epoch = None
+        self.best_preds = None
+        self.val_losses = {}
+        self.should_stop = False
+        self.pending = 0
+        self._since_best = 0
+
+        os.makedirs(snapshot_dir, exist_ok=True)
+        val_df = stratified_subsample(val_df, frac=subsample_frac, n=subsample_n,
+                                      strata=strata, seed=seed)
+        args = (model_fn, device, val_df, criterion, keep_preds)
+
+        if worker == 'thread':
+            self.jobs, self.results = queue.Queue(), queue.Queue()
+            self.worker = threading.Thread(target=_validation_worker,
+                                           args=args + (self.jobs, self.results), daemon=True)
+        elif worker == 'process':
+            ctx = mp.get_context('spawn')
+            self.jobs, self.results = ctx.Queue(), ctx.Queue()
+            self.worker = ctx.Process(target=_validation_worker,
+                                      args=args + (self.jobs, self.results), daemon=True)
+        else:
+            raise ValueError(f"Unknown worker '{worker}', must be 'thread' or 'process'")
+        self.worker.start()
+
+    def submit(self, epoch, model):
+        """
+        Snapshot the model weights and queue them for validation (respects the cadence).
+
+        Returns:
+            True if the epoch was submitted, False if skipped by the cadence
+        """
+        if (epoch + 1) % self.every_n_epochs != 0:
+            return False
+        snapshot_path = os.path.join(self.snapshot_dir, f'snapshot_epoch_{epoch + 1}.pt')
+        state_dict = {k: v.detach().cpu() for k, v in model.state_dict().items()}
+        torch.save(state_dict, snapshot_path)
+        self.jobs.put((epoch, snapshot_path))
+        self.pending += 1
+        return True
+
+    def _handle(self, result):
+        if result['epoch'] is None:
+            raise RuntimeError(f"Validation worker failed to start: {result['error']}")
+        self.pending -= 1
+        if result['error'] is not None:
+            raise RuntimeError(f"Validation of epoch {result['epoch'] + 1} failed: {result['error']}")
+
+        epoch, val_loss = result['epoch'], result['val_loss']
+        self.val_losses[epoch] = val_loss
+        print(f"Epoch {epoch + 1} - Val Loss (async): {val_loss:.4f}")
+
+        if val_loss < self.best_loss:
+            self.best_loss = val_loss
+            self.best_epoch = epoch
+            self.best_preds = result['val_preds']
+            self._since_best = 0
+            if self.best_checkpoint_path is not None:
+                checkpoint = {
+                    'epoch': epoch,
+                    'model_state_dict': torch.load(result['snapshot_path'], map_location='cpu'),
+                    'val_loss': val_loss,
+                    'best_loss': val_loss
+                }
+                torch.save(checkpoint, self.best_checkpoint_path)
+            print(f"✓ New best model saved! Val Loss: {val_loss:.4f}")
+        else:
+            self._since_best += 1
+            if self.patience is not None and self._since_best >= self.patience:
+                self.should_stop = True
+
+        if not self.keep_snapshots:
+            os.remove(result['snapshot_path'])
+
+    def poll(self, block=False):
+        """
+        Collect finished validation results.
+
+        Args:
+            block: Wait for every pending snapshot instead of only collecting finished ones
+
+        Returns:
+            List of result dicts ('epoch', 'val_loss', 'val_preds', 'snapshot_path')
+        """
+        finished = []
+        while self.pending > 0:
+            try:
+                result = self.results.get(block=block, timeout=1.0 if block else None)
+            except queue.Empty:
+                if not block:
+                    break
+                if not self.worker.is_alive():
+                    # Pick up anything the worker reported just before exiting
+                    try:
+                        result = self.results.get(block=False)
+                    except queue.Empty:
+                        raise RuntimeError(f"Validation worker exited with {self.pending} "
+                                           f"snapshot(s) still pending")
+                else:
+                    continue
+            self._handle(result)
+            finished.append(result)
+        return finished
+
+    def close(self):
+        """
+        Wait for outstanding validations, stop the worker and return the remaining results.
+        """
+        finished = self.poll(block=True)
+        self.jobs.put(None)
+        self.worker.join()
+        return finished